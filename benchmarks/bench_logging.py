@@ -0,0 +1,84 @@
+"""
+Caller-side overhead of the logging modes (pretty/JSON, sync/enqueued, sampled).
+
+Run from the project root:  python -m benchmarks.bench_logging
+"""
+from src.utils.logger import configure_logging, logger, request_id_var
+from src.utils.config import config
+import time
+import os
+
+MESSAGES= 20000
+
+
+class SlowStream:
+
+    """ Stream that blocks on every write, standing in for a contended stdout. """
+
+    def __init__(self, stream, delay: float):
+        self.stream= stream
+        self.delay= delay
+
+    def write(self, message: str):
+        time.sleep(self.delay)
+        self.stream.write(message)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run(fmt: str, enqueue, sample_rate: float, sink):
+
+    """ Log MESSAGES success lines and return (caller ms, total ms including the queue drain). """
+
+    # Loguru's own enqueue=True (pickled records) as a baseline for the queue writer
+    native_enqueue= enqueue == "native"
+    enqueue= enqueue is True
+
+    configure_logging(level="DEBUG", fmt=fmt, enqueue=enqueue, sample_rate=sample_rate, sink=sink)
+    if native_enqueue:
+        logger.remove()
+        logger.add(sink, level="DEBUG", format="{message}", enqueue=True)
+    sampled= logger.bind(sampled=True)
+    request_id_var.set("bench")
+
+    start= time.perf_counter()
+    for i in range(MESSAGES):
+        sampled.info("Sucessfully generated simple diff")
+    caller= time.perf_counter() - start
+
+    # Removing the sink drains any queued lines
+    logger.remove()
+    total= time.perf_counter() - start
+
+    return caller * 1000, total * 1000
+
+
+def main():
+
+    modes= [
+        ("pretty", False, 1.0),
+        ("plain", "native", 1.0),
+        ("pretty", True, 1.0),
+        ("json", False, 1.0),
+        ("json", True, 1.0),
+        ("json", True, 0.1),
+    ]
+
+    with open(os.devnull, "w") as devnull:
+
+        for label, sink in (("devnull", devnull), ("slow stream (50us/write)", SlowStream(devnull, 0.00005))):
+
+            print(f"\n{label}: {MESSAGES} messages per mode")
+            print(f"{'format':<8} {'enqueue':<8} {'sample':>7} {'caller ms':>10} {'total ms':>10} {'us/call':>8}")
+
+            for fmt, enqueue, sample_rate in modes:
+                caller_ms, total_ms= run(fmt, enqueue, sample_rate, sink)
+                print(f"{fmt:<8} {str(enqueue):<8} {sample_rate:>7} {caller_ms:>10.1f} {total_ms:>10.1f} {caller_ms * 1000 / MESSAGES:>8.2f}")
+
+    # Restore the configured logging
+    configure_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_ENQUEUE, config.LOG_SAMPLE_RATE)
+
+
+if __name__ == "__main__":
+    main()
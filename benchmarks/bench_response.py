@@ -0,0 +1,76 @@
+"""
+Payload size and serialization time of /suggest-code responses on large files.
+
+Run from the project root:  python -m benchmarks.bench_response
+"""
+from src.api.serialization import shape_response, serialize, compress, MSGPACK_MEDIA_TYPE, orjson, msgpack, brotli
+from src.backend.diff_service import DiffService
+import time
+import json
+
+
+def make_source(lines: int) -> str:
+
+    """ Synthetic Python file of roughly the requested number of lines. """
+
+    blocks= []
+    for i in range(lines // 4):
+        blocks.append(f"def helper_{i}(value):\n    result = value * {i}\n    return result + {i}\n")
+    return "\n".join(blocks)
+
+
+def timed(func, repeat: int = 20):
+
+    """ Return the result of func and its best time in milliseconds. """
+
+    best= float("inf")
+    for _ in range(repeat):
+        start= time.perf_counter()
+        result= func()
+        best= min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+
+    original_code= make_source(20000)
+    improved_code= original_code.replace("return result", "return int(result)")
+
+    result= {
+        "original_code": original_code,
+        "improved_code": improved_code,
+        "explanation": "Cast the results to int.",
+        "diff": DiffService().generate_diff(original_code, improved_code),
+        "success": True,
+    }
+
+    serializers= [("json", "application/json")]
+    if msgpack is not None:
+        serializers.append(("msgpack", MSGPACK_MEDIA_TYPE))
+
+    encodings= ["identity", "gzip"] + (["br"] if brotli is not None else [])
+
+    print(f"orjson: {'yes' if orjson else 'no'}, msgpack: {'yes' if msgpack else 'no'}, brotli: {'yes' if brotli else 'no'}")
+    print(f"{'mode':<10} {'format':<8} {'encoding':<9} {'bytes':>10} {'validate ms':>12} {'serialize ms':>13} {'compress ms':>12}")
+
+    for mode in ("full", "lean", "diff_only", "code_only"):
+
+        shaped_input= dict(result, diff={} if mode == "code_only" else result["diff"])
+        response, validate_ms= timed(lambda: shape_response(shaped_input, mode))
+        payload= response.model_dump(exclude_none=True)
+
+        for name, accept in serializers:
+
+            (body, _), serialize_ms= timed(lambda: serialize(payload, accept))
+
+            for encoding in encodings:
+                (compressed, _), compress_ms= timed(lambda: compress(body, encoding), repeat=5)
+                print(f"{mode:<10} {name:<8} {encoding:<9} {len(compressed):>10} {validate_ms:>12.2f} {serialize_ms:>13.2f} {compress_ms:>12.2f}")
+
+    # Baseline: the default encoder on the full payload
+    _, stdlib_ms= timed(lambda: json.dumps(result).encode("utf-8"))
+    print(f"\nstdlib json.dumps on the full payload: {stdlib_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,114 @@
 import subprocess
+import argparse
 import time
 import sys
 import os
 import signal
+import urllib.request
+import urllib.error
+import json
+from src.utils.config import config
 
-# Start FastAPI (Uvicorn) in the background
-uvicorn_proc = subprocess.Popen(
-    [sys.executable, "-m", "uvicorn", "src.api.fastapi_app:app", "--reload"]
-)
-
-# Wait 10 seconds to ensure FastAPI is up
-print("Waiting 10 seconds for FastAPI backend to start...")
-time.sleep(10)
-
-try:
-    # Start Streamlit (this will block until Streamlit exits)
-    subprocess.run(
-        [sys.executable, "-m", "streamlit", "run", "src/app/streamlit_app.py"]
-    )
-finally:
-    print("Shutting down FastAPI backend...")
-    if os.name == "nt":
-        uvicorn_proc.send_signal(signal.CTRL_BREAK_EVENT)
+
+def parse_args():
+
+    parser= argparse.ArgumentParser(description="Launch the Code Iterator AI backend and frontend")
+    parser.add_argument("--prod", action="store_true", default=config.IS_PRODUCTION,
+                        help="Production mode: multiple workers, no auto-reload (default from APP_ENV)")
+    parser.add_argument("--workers", type=int, default=config.API_WORKERS,
+                        help="Number of uvicorn workers in production mode")
+    parser.add_argument("--timeout", type=float, default=config.API_STARTUP_TIMEOUT,
+                        help="Seconds to wait for the backend to become ready")
+    return parser.parse_args()
+
+
+def uvicorn_command(prod: bool, workers: int) -> list:
+
+    command= [sys.executable, "-m", "uvicorn", "src.api.fastapi_app:app",
+              "--host", config.API_HOST, "--port", str(config.API_PORT)]
+
+    if prod:
+        command+= ["--workers", str(workers), "--no-access-log"]
     else:
-        uvicorn_proc.terminate()
-    uvicorn_proc.wait() 
\ No newline at end of file
+        command.append("--reload")
+
+    return command
+
+
+def wait_until_ready(proc: subprocess.Popen, timeout: float) -> bool:
+
+    """
+    Poll the readiness endpoint until it returns 200, the backend exits, it reports a
+    permanent initialization failure, or the timeout expires. """
+
+    url= f"http://{config.API_HOST}:{config.API_PORT}/api/health"
+    deadline= time.monotonic() + timeout
+    delay= 0.1
+
+    while time.monotonic() < deadline:
+
+        if proc.poll() is not None:
+            return False
+
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except urllib.error.HTTPError as e:
+            # 503 "Starting" means keep waiting, 503 "Unavailable" means initialization failed
+            try:
+                health= json.loads(e.read())
+            except ValueError:
+                health= {}
+            if health.get("status") == "Unavailable":
+                print(f"FastAPI backend failed to initialize: {health.get('message', 'unknown error')}")
+                return False
+        except (urllib.error.URLError, OSError):
+            pass
+
+        time.sleep(delay)
+        delay= min(delay * 2, 1.0)
+
+    return False
+
+
+def main():
+
+    args= parse_args()
+
+    # Start FastAPI (Uvicorn) in the background
+    # Child processes pick up production defaults (logging etc.) from APP_ENV
+    env= dict(os.environ, APP_ENV="production") if args.prod else None
+
+    popen_kwargs= {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == "nt" else {}
+    uvicorn_proc = subprocess.Popen(uvicorn_command(args.prod, args.workers), env=env, **popen_kwargs)
+
+    try:
+        print("Waiting for FastAPI backend to become ready...")
+        start= time.monotonic()
+
+        if not wait_until_ready(uvicorn_proc, args.timeout):
+            print("FastAPI backend did not become ready, see the logs above.")
+            return 1
+
+        print(f"FastAPI backend ready in {time.monotonic() - start:.1f}s")
+
+        # Start Streamlit (this will block until Streamlit exits)
+        streamlit_command= [sys.executable, "-m", "streamlit", "run", "src/app/streamlit_app.py"]
+        if args.prod:
+            streamlit_command+= ["--server.headless", "true", "--server.runOnSave", "false"]
+
+        return subprocess.run(streamlit_command, env=env).returncode
+
+    finally:
+        print("Shutting down FastAPI backend...")
+        if uvicorn_proc.poll() is None:
+            if os.name == "nt":
+                uvicorn_proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                uvicorn_proc.terminate()
+            uvicorn_proc.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
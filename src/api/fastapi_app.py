@@ -1,12 +1,30 @@
-from src.api.routes import router
+from src.api.routes import router, warm_up, shutdown
+from src.api.middleware import RequestIdMiddleware
+from src.utils.logger import logger
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up the heavy services in each worker without blocking liveness
+    warm_up()
+    yield
+    shutdown()
+    # Flush enqueued log records before the worker exits
+    await logger.complete()
+
+
 # Create the FastAPI app instance
 app= FastAPI(
     title="Code Iterator AI API",
     description= "AI-powered code improvement tool",
-    docs_url="/docs"
+    docs_url="/docs",
+    lifespan=lifespan
 )
 
+# Tag every request with a correlation id for the logs
+app.add_middleware(RequestIdMiddleware)
+
 # Include the router
-app.include_router(router, prefix='/api')
\ No newline at end of file
+app.include_router(router, prefix='/api')
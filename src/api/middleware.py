@@ -0,0 +1,44 @@
+from src.utils.logger import request_id_var
+import uuid
+import re
+
+# Incoming request ids are reused only if they look sane
+REQUEST_ID_RE= re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+
+    """ ASGI middleware that assigns a correlation id to each request and echoes it as X-Request-ID. """
+
+    def __init__(self, app):
+
+        self.app= app
+
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id= None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id= value.decode("latin-1")
+                break
+
+        if not request_id or not REQUEST_ID_RE.match(request_id):
+            request_id= uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers= list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message= {**message, "headers": headers}
+            await send(message)
+
+        token= request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -1,5 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Dict
+from typing import Literal, Optional
+
+# Response shaping modes
+# - full: everything, including the echoed original code
+# - lean: everything except the echoed original code
+# - diff_only: diff and explanation, without any code
+# - code_only: improved code only, the diff is not computed
+ResponseMode= Literal["full", "lean", "diff_only", "code_only"]
+
 
 # Define the Request Schema
 class CodeRequest(BaseModel):
@@ -8,6 +16,29 @@ class CodeRequest(BaseModel):
 
     original_code: str= Field(..., description="The original code to be improved")
     user_prompt: str= Field(..., description="User's instruction for code improvement")
+    response_mode: ResponseMode= Field("full", description="Which fields to include in the response")
+
+
+# Define the Diff Schemas
+class ChangesSummary(BaseModel):
+
+    """ Line counts for a diff."""
+
+    original_lines: int= Field(0, description="Number of lines in the original code")
+    improved_lines: int= Field(0, description="Number of lines in the improved code")
+    lines_added: int= Field(0, description="Number of lines added")
+    lines_removed: int= Field(0, description="Number of lines removed")
+
+
+class DiffResult(BaseModel):
+
+    """ Diff information between original and improved code."""
+
+    diff_text: str= Field(..., description="Unified diff text")
+    changes_summary: ChangesSummary= Field(..., description="Summary of the changes")
+    has_changes: bool= Field(..., description="Whether the code was changed")
+    success: bool= Field(..., description="Whether the diff was generated successfully")
+    error: Optional[str]= Field(None, description="Error message if the diff failed")
 
 
 # Define the Response Schema
@@ -15,17 +46,30 @@ class CodeResponse(BaseModel):
 
     """ Response model for code improvement"""
 
-    original_code: str= Field(..., description= "The original code submitted")
-    improved_code: str= Field(..., description="The AI- improved code")
-    explanation: str= Field(..., description="Explanation of changes made")
-    diff: Dict= Field(..., description="Diff information between original and improved code")
+    original_code: Optional[str]= Field(None, description= "The original code submitted")
+    improved_code: Optional[str]= Field(None, description="The AI- improved code")
+    explanation: Optional[str]= Field(None, description="Explanation of changes made")
+    diff: Optional[DiffResult]= Field(None, description="Diff information between original and improved code")
     success: bool= Field(..., description=" Whether the operation was successful or not.")
 
 
+# Executor statistics Schema
+class ExecutorStats(BaseModel):
+
+    """ CPU executor usage and queue time of offloaded tasks"""
+
+    inline: int= Field(..., description="Number of calls run inline")
+    offloaded: int= Field(..., description="Number of calls run in the process pool")
+    queue_ms_total: float= Field(..., description="Total queue time of offloaded calls in milliseconds")
+    queue_ms_max: float= Field(..., description="Longest queue time of an offloaded call in milliseconds")
+    queue_ms_avg: float= Field(..., description="Average queue time of offloaded calls in milliseconds")
+
+
 # Health check Schema
 class HealthResponse(BaseModel):
-    
+
     """ Health check response"""
 
     status: str= Field(..., description="API Status")
-    message: str = Field(..., description="Health check message")
\ No newline at end of file
+    message: str = Field(..., description="Health check message")
+    executor: Optional[ExecutorStats]= Field(None, description="CPU executor statistics of this worker, once ready")
@@ -1,32 +1,119 @@
-from src.utils.logger import logger
-from src.backend.code_iterator import CodeIteratorOrchestrator
-from src.api.models import CodeRequest, CodeResponse, HealthResponse
-from fastapi import APIRouter, HTTPException
+from src.utils.logger import logger, sampled_logger
+from src.api.models import CodeRequest, CodeResponse, ExecutorStats, HealthResponse
+from src.api.serialization import DecompressingRoute, encode_response, shape_response
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+import threading
 
 
-# Create the router instance
-router=APIRouter()
+# Create the router instance (accepts gzip/brotli encoded request bodies)
+router=APIRouter(route_class=DecompressingRoute)
 
-# Initialize the orchestrator
-orchestrator=CodeIteratorOrchestrator()
+# The orchestrator (and with it langchain, langgraph and the Google SDK) is created lazily,
+# so the app imports fast and each worker can warm it up in the background
+_orchestrator= None
+_orchestrator_error= None
+_orchestrator_lock= threading.Lock()
 
-# Define the health check endpoint
+
+def get_orchestrator():
+
+    """ Return the orchestrator, creating it on first use. """
+
+    global _orchestrator, _orchestrator_error
+
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                try:
+                    from src.backend.code_iterator import CodeIteratorOrchestrator
+                    _orchestrator= CodeIteratorOrchestrator()
+                    _orchestrator_error= None
+                except Exception as e:
+                    _orchestrator_error= str(e)
+                    logger.error(f"Orchestrator initialization failed: {str(e)}")
+                    raise
+
+    return _orchestrator
+
+
+def warm_up():
+
+    """ Initialize the orchestrator in a background thread. """
+
+    def _warm():
+        try:
+            get_orchestrator()
+            logger.info("Worker warmed up and ready")
+        except Exception:
+            pass
+
+    threading.Thread(target=_warm, name="orchestrator-warmup", daemon=True).start()
+
+
+def shutdown():
+
+    """ Release the orchestrator's worker processes. """
+
+    if _orchestrator is not None:
+        _orchestrator.shutdown()
+
+
+def _process_code_request(request: CodeRequest, accept: str, accept_encoding: str) -> Response:
+
+    """ Run the orchestrator, then shape, serialize and compress the response (called in the threadpool). """
+
+    result= get_orchestrator().process_code_request(
+        original_code=request.original_code,
+        user_prompt=request.user_prompt,
+        include_diff=request.response_mode != "code_only"
+    )
+
+    response= shape_response(result, request.response_mode)
+    return encode_response(response, accept, accept_encoding)
+
+
+# Define the liveness endpoint
+@router.get("/live", response_model=HealthResponse)
+async def liveness_check():
+    """ Liveness endpoint: the process is up and serving requests."""
+    return HealthResponse(
+        status="Alive",
+        message="Code iterator API process is running"
+    )
+
+
+# Define the health check (readiness) endpoint
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """ Health check endpoint."""
-    logger.info("Health check requested")
+async def health_check(response: Response):
+    """ Readiness endpoint: returns 503 until the orchestrator is initialized."""
+    sampled_logger.info("Health check requested")
+
+    if _orchestrator is None:
+        response.status_code= 503
+        return HealthResponse(
+            status="Unavailable" if _orchestrator_error else "Starting",
+            message=_orchestrator_error or "Code iterator API is warming up"
+        )
+
     return HealthResponse(
         status="Healthy",
-        message="Code iterator API is running"
+        message="Code iterator API is running",
+        executor=ExecutorStats(**_orchestrator.executor.stats())
     )
 
 
 # Define the code iterator endpoint
 @router.post("/suggest-code", response_model=CodeResponse)
-async def suggest_code(request: CodeRequest):
+async def suggest_code(request: CodeRequest, http_request: Request):
     """ Main endpoint for code improvement suggestions"""
+
+    # Initialization already failed in this worker: report it instead of retrying on every request
+    if _orchestrator is None and _orchestrator_error:
+        raise HTTPException(status_code=503, detail=f"Service unavailable: {_orchestrator_error}")
+
     try: 
-        logger.info("Code suggestion requested")
+        sampled_logger.info("Code suggestion requested")
 
         # Basic input validation
         if not request.original_code.strip():
@@ -35,11 +122,14 @@ async def suggest_code(request: CodeRequest):
         if not request.user_prompt.strip():
             raise HTTPException( status_code=400, detail="User prompt cannot be empty")
 
-        # Process the request through the orchestrator
-        result= orchestrator.process_code_request(original_code=request.original_code, user_prompt=request.user_prompt)
-
-        # Return the response
-        return result
+        # Process the request and encode the response off the event loop so other requests keep flowing.
+        # get_orchestrator() runs in the threadpool too, as it may wait for the warm-up to finish.
+        return await run_in_threadpool(
+            _process_code_request,
+            request,
+            http_request.headers.get("accept", ""),
+            http_request.headers.get("accept-encoding", "")
+        )
 
     except Exception as e:
         logger.error(f"Unexpected error:{str(e)}")
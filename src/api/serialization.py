@@ -0,0 +1,224 @@
+from src.api.models import CodeResponse, ResponseMode
+from src.utils.config import config
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from typing import Callable, Dict, Tuple
+import gzip
+import json
+import zlib
+
+# Optional fast serializers and compressors
+try:
+    import orjson
+except ImportError:
+    orjson= None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack= None
+
+try:
+    import brotli
+except ImportError:
+    brotli= None
+
+
+# Responses smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE= 1024
+
+MSGPACK_MEDIA_TYPE= "application/msgpack"
+
+# Input chunk size for brotli versions without output_buffer_limit
+BROTLI_INPUT_CHUNK= 1024
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+def decompress_gzip(body: bytes, limit: int) -> bytes:
+
+    """ Decompress a (possibly multi-member) gzip body, producing at most limit bytes in total. """
+
+    output= bytearray()
+    data= body
+
+    while True:
+
+        decompressor= zlib.decompressobj(16 + zlib.MAX_WBITS)
+        output+= decompressor.decompress(data, limit - len(output) + 1)
+
+        if len(output) > limit or decompressor.unconsumed_tail:
+            raise BodyTooLarge()
+
+        if not decompressor.eof:
+            raise ValueError("truncated gzip stream")
+
+        # Continue with the next gzip member, if any
+        data= decompressor.unused_data
+        if not data:
+            return bytes(output)
+
+
+def decompress_brotli(body: bytes, limit: int) -> bytes:
+
+    """ Decompress a brotli body, producing at most limit bytes. """
+
+    decompressor= brotli.Decompressor()
+
+    try:
+        output= decompressor.process(body, output_buffer_limit=limit + 1)
+    except TypeError:
+        # brotli < 1.2: feed small input chunks and check the size as it grows
+        output= bytearray()
+        for offset in range(0, len(body), BROTLI_INPUT_CHUNK):
+            output+= decompressor.process(body[offset:offset + BROTLI_INPUT_CHUNK])
+            if len(output) > limit:
+                raise BodyTooLarge()
+        output= bytes(output)
+
+    if len(output) > limit:
+        raise BodyTooLarge()
+
+    if not decompressor.is_finished():
+        raise ValueError("truncated brotli stream")
+
+    return output
+
+
+def shape_response(result: Dict, mode: ResponseMode) -> CodeResponse:
+
+    """ Build the response model keeping only the fields requested by the mode. """
+
+    if mode == "full":
+        fields= ("original_code", "improved_code", "explanation", "diff")
+    elif mode == "lean":
+        fields= ("improved_code", "explanation", "diff")
+    elif mode == "diff_only":
+        fields= ("explanation", "diff")
+    else:
+        fields= ("improved_code",)
+
+    shaped= {field: result[field] for field in fields if result.get(field) not in (None, {})}
+    return CodeResponse(success=result["success"], **shaped)
+
+
+def serialize(payload: Dict, accept: str) -> Tuple[bytes, str]:
+
+    """ Serialize with msgpack when the client asks for it, otherwise JSON (orjson when available). """
+
+    if msgpack is not None and MSGPACK_MEDIA_TYPE in accept:
+        return msgpack.packb(payload, use_bin_type=True), MSGPACK_MEDIA_TYPE
+
+    if orjson is not None:
+        return orjson.dumps(payload), "application/json"
+
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), "application/json"
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+
+    """ Encodings listed in an Accept-Encoding header, leaving out those refused with q=0. """
+
+    accepted= set()
+
+    for part in accept_encoding.split(","):
+
+        name, *params= [item.strip() for item in part.split(";")]
+        quality= 1.0
+
+        for param in params:
+            key, _, value= param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality= float(value)
+                except ValueError:
+                    quality= 0.0
+
+        if name and quality > 0:
+            accepted.add(name.lower())
+
+    return accepted
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, str]:
+
+    """ Compress with brotli or gzip depending on what the client accepts. Returns the encoding used. """
+
+    if len(body) < MIN_COMPRESS_SIZE:
+        return body, ""
+
+    accepted= accepted_encodings(accept_encoding)
+
+    if brotli is not None and "br" in accepted:
+        return brotli.compress(body, quality=4), "br"
+
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=5), "gzip"
+
+    return body, ""
+
+
+def encode_response(response: CodeResponse, accept: str, accept_encoding: str) -> Response:
+
+    """ Serialize and compress a response model according to the Accept and Accept-Encoding headers. """
+
+    payload= response.model_dump(exclude_none=True)
+
+    body, media_type= serialize(payload, accept)
+    body, encoding= compress(body, accept_encoding)
+
+    headers= {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"]= encoding
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class DecompressedRequest(Request):
+
+    """ Request whose body is transparently decoded from gzip or brotli. """
+
+    async def body(self) -> bytes:
+
+        if not hasattr(self, "_body"):
+
+            body= await super().body()
+            encoding= self.headers.get("content-encoding", "").strip().lower()
+
+            if encoding == "gzip":
+                decoder= decompress_gzip
+            elif encoding == "br" and brotli is not None:
+                decoder= decompress_brotli
+            elif encoding in ("", "identity"):
+                decoder= None
+            else:
+                raise HTTPException(status_code=415, detail=f"Unsupported content encoding: {encoding}")
+
+            if decoder is not None:
+                limit= config.MAX_DECOMPRESSED_BODY_BYTES
+                try:
+                    body= decoder(body, limit)
+                except BodyTooLarge:
+                    raise HTTPException(status_code=413, detail=f"Decompressed request body exceeds {limit} bytes")
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Invalid {encoding} request body: {str(e)}")
+
+            self._body= body
+
+        return self._body
+
+
+class DecompressingRoute(APIRoute):
+
+    """ Route class that accepts gzip and brotli encoded request bodies. """
+
+    def get_route_handler(self) -> Callable:
+
+        original_handler= super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            return await original_handler(DecompressedRequest(request.scope, request.receive))
+
+        return handler
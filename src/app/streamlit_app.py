@@ -1,6 +1,11 @@
 import streamlit as st
 import requests
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from requests.adapters import HTTPAdapter
 from streamlit_ace import st_ace
+from src.utils.config import config
 from src.utils.logger import logger
 
 st.set_page_config(
@@ -10,12 +15,113 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+API_BASE_URL = f"http://{config.API_HOST}:{config.API_PORT}/api"
+HEALTH_TTL_SECONDS = 10
+# How often the header re-reads the cached status (no request is sent unless it is older than the TTL)
+HEALTH_POLL_SECONDS = 1
+HEALTH_TIMEOUT_SECONDS = 2
+SUGGEST_TIMEOUT_SECONDS = 120
+
+
+class ApiClient:
+    """Shared API client: pooled keep-alive session, cached health status and background requests."""
+
+    def __init__(self, api_base_url):
+        self.health_endpoint = f"{api_base_url}/health"
+        self.suggest_code_endpoint = f"{api_base_url}/suggest-code"
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="api-client")
+        # Health checks get their own thread so long-running suggestions can't delay them
+        self.health_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-health")
+
+        self._lock = threading.Lock()
+        self._healthy = None
+        self._health_checked_at = 0.0
+        self._health_future = None
+
+    def _check_health(self):
+        try:
+            response = self.session.get(self.health_endpoint, timeout=HEALTH_TIMEOUT_SECONDS)
+            healthy = response.status_code == 200
+        except requests.exceptions.RequestException:
+            healthy = False
+
+        with self._lock:
+            self._healthy = healthy
+            self._health_checked_at = time.monotonic()
+        return healthy
+
+    def refresh_health(self, force=False) -> Future:
+        """Start a background health check when the cached status is older than the TTL."""
+        with self._lock:
+            stale = force or time.monotonic() - self._health_checked_at > HEALTH_TTL_SECONDS
+            if stale and (self._health_future is None or self._health_future.done()):
+                self._health_future = self.health_executor.submit(self._check_health)
+            return self._health_future
+
+    def health(self):
+        """Return the cached health status without blocking (None until the first check finishes)."""
+        self.refresh_health()
+        return self._healthy
+
+    def submit_suggestion(self, original_code: str, user_prompt: str) -> Future:
+        """Send the code suggestion request in the background."""
+        return self.executor.submit(self._suggest_code, original_code, user_prompt)
+
+    def _suggest_code(self, original_code: str, user_prompt: str):
+        try:
+            response = self.session.post(
+                self.suggest_code_endpoint,
+                json={
+                    "original_code": original_code,
+                    "user_prompt": user_prompt,
+                    "response_mode": "lean"
+                },
+                timeout=SUGGEST_TIMEOUT_SECONDS
+            )
+
+            if response.status_code == 200:
+                try:
+                    result = response.json()
+                except ValueError:
+                    logger.error("API returned a response that is not valid JSON")
+                    return {"result": None, "error": "⚠️ The API returned an invalid response. Please try again."}
+                logger.info("Successfully received API response")
+                return {"result": result, "error": None}
+
+            error_msg = f"API Error: {response.status_code}"
+            try:
+                error_detail = response.json().get("detail", "Unknown error")
+                error_msg += f" - {error_detail}"
+            except ValueError:
+                error_msg += f" - {response.text}"
+
+            logger.error(f"API error: {error_msg}")
+            return {"result": None, "error": error_msg}
+
+        except requests.exceptions.ConnectionError:
+            return {"result": None, "error": f"❌ Cannot connect to API. Make sure the FastAPI server is running on port {config.API_PORT}."}
+        except requests.exceptions.Timeout:
+            return {"result": None, "error": "⏱️ Request timed out. The AI might be taking longer than usual. Please try again."}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API call failed: {str(e)}")
+            return {"result": None, "error": f"🔗 Connection Error: {str(e)}"}
+
+
+@st.cache_resource
+def get_api_client():
+    return ApiClient(API_BASE_URL)
+
+
 class CodeIteratorUI:
     def __init__(self):
-        self.api_base_url = "http://localhost:8000/api"
-        self.health_endpoint = f"{self.api_base_url}/health"
-        self.suggest_code_endpoint = f"{self.api_base_url}/suggest-code"
-        
+        self.api_client = get_api_client()
+
         if 'current_code' not in st.session_state:
             st.session_state.current_code = ""
         if 'previous_code' not in st.session_state:
@@ -28,12 +134,15 @@ class CodeIteratorUI:
             st.session_state.api_result = None
         if 'force_editor_update' not in st.session_state:
             st.session_state.force_editor_update = False
+        if 'pending_request' not in st.session_state:
+            st.session_state.pending_request = None
 
-    def check_api_health(self):
+    def check_api_health(self, wait=False):
+        if not wait:
+            return self.api_client.health()
         try:
-            response = requests.get(self.health_endpoint, timeout=5)
-            return response.status_code == 200
-        except:
+            return self.api_client.refresh_health(force=True).result(timeout=HEALTH_TIMEOUT_SECONDS + 1)
+        except TimeoutError:
             return False
 
     def render_header(self):
@@ -46,13 +155,20 @@ class CodeIteratorUI:
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            if self.check_api_health():
-                st.success("✅ API is running and ready")
-            else:
-                st.error("❌ API is not running. Please start the FastAPI server first.")
+            self.render_api_status()
         
         st.markdown("---")
 
+    @st.fragment(run_every=HEALTH_POLL_SECONDS)
+    def render_api_status(self):
+        healthy = self.check_api_health()
+        if healthy is None:
+            st.info("⏳ Checking API status...")
+        elif healthy:
+            st.success("✅ API is running and ready")
+        else:
+            st.error("❌ API is not running. Please start the FastAPI server first.")
+
     def render_sidebar(self):
         with st.sidebar:
             st.markdown("""
@@ -90,7 +206,7 @@ class CodeIteratorUI:
             st.markdown("---")
             
             if st.button("🔄 Check API Health", use_container_width=True):
-                if self.check_api_health():
+                if self.check_api_health(wait=True):
                     st.success("🎉 API is healthy and responsive!")
                 else:
                     st.error("💥 API is not responding")
@@ -194,50 +310,38 @@ class CodeIteratorUI:
                 st.session_state.current_prompt = ""
                 st.session_state.previous_code = ""
                 st.session_state.api_result = None
+                st.session_state.pending_request = None
                 st.session_state.force_editor_update = True
                 st.rerun()
         
         return current_code, user_prompt, submit_button
 
-    def call_api(self, original_code: str, user_prompt: str):
-        try:
-            with st.spinner("🤖 AI is analyzing your code... Please wait"):
-                response = requests.post(
-                    self.suggest_code_endpoint,  
-                    json={
-                        "original_code": original_code,
-                        "user_prompt": user_prompt
-                    },
-                    headers={"Content-Type": "application/json"},
-                    timeout=120
-                )
-                
-            if response.status_code == 200:
-                result = response.json()
-                logger.info("Successfully received API response")
-                return result
-            else:
-                error_msg = f"API Error: {response.status_code}"
-                try:
-                    error_detail = response.json().get("detail", "Unknown error")
-                    error_msg += f" - {error_detail}"
-                except:
-                    error_msg += f" - {response.text}"
-                
-                st.error(error_msg)
-                logger.error(f"API error: {error_msg}")
-                return None
-                
-        except requests.exceptions.ConnectionError:
-            st.error("❌ Cannot connect to API. Make sure the FastAPI server is running on port 8000.")
-            return None
-        except requests.exceptions.Timeout:
-            st.error("⏱️ Request timed out. The AI might be taking longer than usual. Please try again.")
-            return None
-        except requests.exceptions.RequestException as e:
-            st.error(f"🔗 Connection Error: {str(e)}")
-            logger.error(f"API call failed: {str(e)}")
-            return None
+    def collect_result(self, future: Future):
+        response = future.result()
+        st.session_state.pending_request = None
+
+        if response["error"]:
+            st.error(response["error"])
+        else:
+            st.session_state.api_result = response["result"]
+
+    @st.fragment(run_every=1)
+    def poll_pending_request(self):
+        future = st.session_state.pending_request
+        if future is None:
+            return
+        if future.done():
+            st.rerun()
+        st.info("🤖 AI is analyzing your code... You can keep editing while you wait.")
+
+    def render_pending_request(self):
+        future = st.session_state.pending_request
+        if future is None:
+            return
+        if future.done():
+            self.collect_result(future)
+        else:
+            self.poll_pending_request()
 
     def render_results(self, result_data):
         if not result_data:
@@ -335,11 +439,14 @@ class CodeIteratorUI:
                 st.warning("⚠️ Please describe what you want to improve.")
                 return
             else:
-                st.session_state.last_prompt = user_prompt
-                
-                result = self.call_api(original_code, user_prompt)
-                if result:
-                    st.session_state.api_result = result
+                pending = st.session_state.pending_request
+                if pending is not None and not pending.done():
+                    st.warning("⏳ A suggestion is already in progress.")
+                else:
+                    st.session_state.last_prompt = user_prompt
+                    st.session_state.pending_request = self.api_client.submit_suggestion(original_code, user_prompt)
+
+        self.render_pending_request()
 
         if st.session_state.api_result:
             self.render_results(st.session_state.api_result)
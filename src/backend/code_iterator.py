@@ -1,38 +1,117 @@
-from src.utils.logger import logger
+from src.utils.logger import logger, sampled_logger
 from src.backend.llm_service import LLMService
 from src.backend.diff_service import DiffService
+from src.backend.executor import CPUExecutor
+from src.backend.symbol_index import SymbolIndex
+from src.utils.config import config
 from typing import TypedDict, Dict
+import threading
 from langgraph.graph import StateGraph,  START, END
 
 # Define the worflow state
 class WorkflowState(TypedDict):
     original_code: str
     user_prompt: str
+    project_context: str
     improved_code: str
     explanation: str
     diff_result: dict
     success: bool
+    include_diff: bool
 
 
 class CodeIteratorOrchestrator:
 
     def __init__(self):
-        
-        self.llm_service= LLMService()
-        self.diff_service= DiffService()
+
+        # Process pool for CPU-heavy steps on large inputs; started last, once everything else is built
+        self.executor= CPUExecutor(
+            max_workers=config.CPU_POOL_WORKERS,
+            threshold=config.CPU_OFFLOAD_THRESHOLD_CHARS,
+            slow_queue_ms=config.CPU_SLOW_QUEUE_MS,
+            preload=("src.backend.diff_service", "src.backend.llm_service")
+        )
+        self._index_stop= threading.Event()
+
+        try:
+
+            self.llm_service= LLMService(executor=self.executor)
+            self.diff_service= DiffService()
+
+            # Optional project index for cross-file context, refreshed in the background
+            self.symbol_index= None
+            if config.PROJECT_INDEX_ROOT:
+                try:
+                    self.symbol_index= SymbolIndex(config.PROJECT_INDEX_ROOT, config.PROJECT_INDEX_PATH)
+                    threading.Thread(target=self._refresh_index_loop, name="symbol-index-refresh", daemon=True).start()
+                except Exception as e:
+                    logger.error(f"Symbol index disabled: {str(e)}")
+
+            # Compile the workflow once per process
+            self.workflow= self._build_workflow()
+
+            # Warm up the worker processes
+            self.executor.start()
+
+        except Exception:
+            # Don't leave worker processes or the refresher behind when initialization fails
+            self.shutdown()
+            raise
 
         logger.info("Code Iterator Orchestrator initialized")
 
 
+    def shutdown(self):
+
+        """ Stop the index refresher and release the worker processes. """
+
+        self._index_stop.set()
+        self.executor.shutdown()
+
+
+    def _refresh_index_loop(self):
+
+        """ Keep the symbol index up to date off the request path. """
+
+        while not self._index_stop.wait(config.PROJECT_INDEX_REFRESH_SECONDS):
+            try:
+                self.symbol_index.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing symbol index: {str(e)}")
+
+
+    def retrieve_context(self, state: WorkflowState):
+
+        """ Collect relevant project definitions within the token budget. """
+
+        if self.symbol_index is None:
+            return {"project_context": ""}
+
+        sampled_logger.debug("Retrieving project context")
+
+        try:
+            project_context= self.symbol_index.build_context(
+                state["original_code"],
+                state["user_prompt"],
+                config.PROJECT_CONTEXT_TOKEN_BUDGET
+            )
+        except Exception as e:
+            logger.error(f"Error retrieving project context: {str(e)}")
+            project_context= ""
+
+        return {"project_context": project_context}
+
+
     def process_with_llm(self, state: WorkflowState):
 
         """ Get the improved code from the LLM."""
 
-        logger.debug("Processing with LLM")
+        sampled_logger.debug("Processing with LLM")
 
         result=self.llm_service.generate_code_suggestion(
             state["original_code"],
-            state['user_prompt']
+            state['user_prompt'],
+            state["project_context"]
         )
 
 
@@ -47,47 +126,60 @@ class CodeIteratorOrchestrator:
 
         """ Generate the diff. """
 
-        logger.debug("Generating diff")
+        if not state["include_diff"]:
+            return {"diff_result": {}}
 
-        diff_result= self.diff_service.generate_diff(
+        sampled_logger.debug("Generating diff")
+
+        # Run the diff in a worker process for large inputs
+        diff_result= self.executor.run(
+            self.diff_service.generate_diff,
             state["original_code"],
-            state["improved_code"]
+            state["improved_code"],
+            size=len(state["original_code"]) + len(state["improved_code"])
         )
 
 
         return {"diff_result": diff_result}
 
     
-    def process_code_request(self, original_code: str, user_prompt: str) -> Dict: 
+    def _build_workflow(self):
 
-        # Build the workflow: START -> LLM -> DIFF -> END   
+        # Build the workflow: START -> CONTEXT -> LLM -> DIFF -> END
         graph= StateGraph(WorkflowState)
 
 
         # Add the nodes
+        graph.add_node("context_step", self.retrieve_context)
         graph.add_node("llm_step", self.process_with_llm)
         graph.add_node("diff_step", self.generate_diff)
 
 
         # Add the edges
-        graph.add_edge(START, "llm_step")
+        graph.add_edge(START, "context_step")
+        graph.add_edge("context_step", "llm_step")
         graph.add_edge("llm_step", "diff_step")
         graph.add_edge("diff_step", END)
 
         # Compile the workflow
-        workflow=graph.compile()
+        return graph.compile()
+
+
+    def process_code_request(self, original_code: str, user_prompt: str, include_diff: bool = True) -> Dict:
 
         # Intitial State
         initial_state: WorkflowState = {
             "original_code": original_code,
             "user_prompt": user_prompt,
+            "project_context": "",
             "improved_code": "",
             "explanation": "",
             "diff_result": {},
             "success": False,
+            "include_diff": include_diff,
         }
         # Run the workflow
-        final_state=workflow.invoke(initial_state)
+        final_state=self.workflow.invoke(initial_state)
 
         # Return the results
         return{
@@ -1,4 +1,4 @@
-from src.utils.logger import logger
+from src.utils.logger import logger, sampled_logger
 from typing import Dict, List
 import difflib
 
@@ -38,7 +38,7 @@ class DiffService:
             # Count basic changes
             changes_summary= self._count_changes(original_lines, improved_lines)
 
-            logger.info("Sucessfully generated simple diff")
+            sampled_logger.info("Sucessfully generated simple diff")
 
 
             return{
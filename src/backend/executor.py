@@ -0,0 +1,126 @@
+from src.utils.logger import logger, sampled_logger
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Optional
+import multiprocessing
+import importlib
+import threading
+import time
+import os
+
+
+def _preload(modules: Iterable[str]):
+
+    """ Pool initializer: import the heavy modules once per worker process. """
+
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _ping() -> int:
+
+    return os.getpid()
+
+
+def _timed_call(submitted_at: float, func: Callable, args: tuple):
+
+    """ Run func in the worker and report how long the task waited in the queue. """
+
+    queue_time= time.monotonic() - submitted_at
+
+    try:
+        return queue_time, func(*args)
+    except Exception as e:
+        # Library exceptions are not always picklable, so send back a plain one
+        raise RuntimeError(f"{type(e).__name__}: {str(e)}") from None
+
+
+class CPUExecutor:
+
+    """
+    Runs CPU-heavy work in a process pool once the input length (in characters) passes
+    a threshold. Smaller inputs run inline to avoid the IPC overhead. """
+
+    def __init__(self, max_workers: int, threshold: int, slow_queue_ms: float = 250.0, preload: Iterable[str] = ()):
+
+        self.max_workers= max_workers
+        self.threshold= threshold
+        self.slow_queue_ms= slow_queue_ms
+        self.preload= tuple(preload)
+        self.pool: Optional[ProcessPoolExecutor]= None
+
+        self._lock= threading.Lock()
+        self._stats= {"inline": 0, "offloaded": 0, "queue_ms_total": 0.0, "queue_ms_max": 0.0}
+
+
+    def start(self):
+
+        """ Create the pool and spawn every worker up front so the first large request does not pay for it. """
+
+        if self.max_workers <= 0:
+            logger.info("CPU executor disabled, running everything inline")
+            return
+
+        start= time.monotonic()
+
+        # spawn: forking a process that already runs threads is unsafe
+        self.pool= ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload,
+            initargs=(self.preload,)
+        )
+
+        pids= {future.result() for future in [self.pool.submit(_ping) for _ in range(self.max_workers)]}
+
+        logger.info(f"CPU executor warmed up: {len(pids)} workers in {(time.monotonic() - start) * 1000:.0f} ms")
+
+
+    def run(self, func: Callable, *args, size: int):
+
+        """ Call func(*args), in the pool when size (input length in characters) reaches the threshold, inline otherwise. """
+
+        if self.pool is None or size < self.threshold:
+            with self._lock:
+                self._stats["inline"]+= 1
+            return func(*args)
+
+        try:
+            queue_time, result= self.pool.submit(_timed_call, time.monotonic(), func, args).result()
+
+        except BrokenProcessPool as e:
+            logger.error(f"CPU executor pool is broken, running inline: {str(e)}")
+            self.pool= None
+            return func(*args)
+
+        queue_ms= queue_time * 1000
+
+        with self._lock:
+            self._stats["offloaded"]+= 1
+            self._stats["queue_ms_total"]+= queue_ms
+            self._stats["queue_ms_max"]= max(self._stats["queue_ms_max"], queue_ms)
+
+        if queue_ms >= self.slow_queue_ms:
+            logger.warning(f"Offloaded {func.__name__} ({size} chars) waited {queue_ms:.1f} ms in the pool queue")
+        else:
+            sampled_logger.debug(f"Offloaded {func.__name__} ({size} chars), queued {queue_ms:.1f} ms")
+
+        return result
+
+
+    def stats(self) -> Dict:
+
+        """ Counts of inline and offloaded calls and the queue time of offloaded ones. """
+
+        with self._lock:
+            stats= dict(self._stats)
+
+        stats["queue_ms_avg"]= stats["queue_ms_total"] / stats["offloaded"] if stats["offloaded"] else 0.0
+        return stats
+
+
+    def shutdown(self):
+
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool= None
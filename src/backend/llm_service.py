@@ -1,8 +1,8 @@
 from src.utils.config import config
-from src.utils.logger import logger
+from src.utils.logger import logger, sampled_logger
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
 from pydantic import BaseModel, Field
 
 # Define the output schema
@@ -13,9 +13,31 @@ class CodeSuggestion(BaseModel):
 
 
 
+# Process-local parser used by parse_code_suggestion
+_parser= None
+
+
+def parse_code_suggestion(text: str) -> dict:
+
+    """ Parse the raw LLM output into CodeSuggestion fields. Module-level so the CPU executor can run it in a worker process. """
+
+    global _parser
+
+    if _parser is None:
+        _parser= PydanticOutputParser(pydantic_object=CodeSuggestion)
+
+    result: CodeSuggestion= _parser.parse(text)
+
+    return {"improved_code": result.improved_code, "explanation": result.explanation}
+
+
+
 class LLMService:
 
-    def __init__(self):
+    def __init__(self, executor=None):
+
+        # Optional CPU executor used to parse large outputs in a worker process
+        self.executor= executor
 
         # Initialize the LLM
         self.llm= ChatGoogleGenerativeAI(model='gemini-2.5-flash', api_key= config.GOOGLE_API_KEY)
@@ -46,7 +68,8 @@ class LLMService:
                 ("human", (f""" 
                 
                                 Original code: {{original_code}}
-                                User prompt: {{user_prompt}} """
+                                User prompt: {{user_prompt}}
+                                Related definitions from the project (reference only, do not rewrite): {{project_context}} """
 
                             )
                 
@@ -54,31 +77,38 @@ class LLMService:
                 
             ])
 
-        # Define the chain
-        self.chain= self.prompt | self.llm | self.parser
+        # Define the chain (the output is parsed separately so large outputs can be offloaded)
+        self.chain= self.prompt | self.llm | StrOutputParser()
 
 
     
-    def generate_code_suggestion(self, original_code: str, user_prompt: str) -> dict:
+    def generate_code_suggestion(self, original_code: str, user_prompt: str, project_context: str = "") -> dict:
 
         try:
             
-            logger.debug("Sending request to the LLM.")
+            sampled_logger.debug("Sending request to the LLM.")
 
             # Call the chain with the inputs
 
-            result: CodeSuggestion = self.chain.invoke({
+            raw_output: str = self.chain.invoke({
                     "original_code": original_code,
                     "user_prompt": user_prompt,
+                    "project_context": project_context or "None",
                     "format_instructions": self.parser.get_format_instructions()
                 })
 
-            logger.info("Received the code suggestion successfully")
+            # Parse the JSON output, in a worker process for large outputs
+            if self.executor is not None:
+                result= self.executor.run(parse_code_suggestion, raw_output, size=len(raw_output))
+            else:
+                result= parse_code_suggestion(raw_output)
+
+            sampled_logger.info("Received the code suggestion successfully")
 
             return{
                 
-                "improved_code": result.improved_code,
-                "explanation": result.explanation,
+                "improved_code": result["improved_code"],
+                "explanation": result["explanation"],
                 "success": True,
             }
         
@@ -0,0 +1,370 @@
+from src.utils.logger import logger
+from typing import Dict, List, Optional
+from collections import Counter
+import threading
+import tempfile
+import math
+import json
+import ast
+import os
+import re
+
+
+# Directories that never contain project sources worth indexing
+SKIP_DIRS= {".git", ".hg", ".svn", "__pycache__", "venv", ".venv", "env", "node_modules",
+            ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", "build", "dist"}
+
+INDEX_VERSION= 1
+
+# BM25 parameters
+BM25_K1= 1.5
+BM25_B= 0.75
+
+# Bonus added when a snippet references a symbol by its exact name
+EXACT_NAME_BONUS= 5.0
+
+IDENTIFIER_RE= re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+CAMEL_RE= re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+
+    """ Split text into lowercase identifier tokens, including snake_case and camelCase parts. """
+
+    tokens= []
+
+    for identifier in IDENTIFIER_RE.findall(text):
+
+        lowered= identifier.lower()
+        tokens.append(lowered)
+
+        parts= [part.lower() for chunk in identifier.split("_") for part in CAMEL_RE.findall(chunk)]
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if len(part) > 1)
+
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+
+    """ Rough LLM token estimate (about four characters per token). """
+
+    return max(1, len(text) // 4)
+
+
+class SymbolIndex:
+
+    """
+    On-disk index of the functions, classes and methods of a Python project,
+    searchable with BM25 and refreshed incrementally per file. Searches only read
+    the current snapshot; call refresh() periodically (outside the request path)
+    to pick up changes. """
+
+    def __init__(self, root: str, index_path: str):
+
+        self.root= os.path.abspath(root)
+        self.index_path= index_path if os.path.isabs(index_path) else os.path.join(self.root, index_path)
+
+        # Per-file entries: {"mtime_ns", "size", "symbols": [...]}
+        self.files: Dict[str, Dict]= {}
+
+        # Corpus statistics kept in sync with self.files
+        self.doc_freq: Counter= Counter()
+        self.total_length= 0
+        self.symbol_count= 0
+
+        # _lock guards the corpus against concurrent searches; _refresh_lock serializes refreshes
+        self._lock= threading.Lock()
+        self._refresh_lock= threading.Lock()
+
+        self._load()
+        self.refresh()
+
+        logger.info(f"Symbol index ready: {self.symbol_count} symbols in {len(self.files)} files")
+
+
+    def _load(self):
+
+        """ Load a previously saved index, ignoring missing or incompatible files. """
+
+        if not os.path.exists(self.index_path):
+            return
+
+        try:
+
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data= json.load(f)
+
+            if data.get("version") != INDEX_VERSION or data.get("root") != self.root:
+                logger.info("Discarding stale symbol index")
+                return
+
+            for path, entry in data.get("files", {}).items():
+                self._add_file_entry(path, entry)
+
+        except (OSError, ValueError) as e:
+
+            logger.warning(f"Could not load symbol index: {str(e)}")
+
+
+    def save(self):
+
+        """ Write the index to disk atomically. """
+
+        data= {"version": INDEX_VERSION, "root": self.root, "files": self.files}
+        tmp_path= None
+
+        try:
+
+            # Per-process temp file, so API workers saving at the same time never share one
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=os.path.dirname(self.index_path),
+                prefix=f"{os.path.basename(self.index_path)}.",
+                suffix=".tmp",
+                delete=False
+            ) as f:
+                tmp_path= f.name
+                json.dump(data, f, separators=(",", ":"))
+
+            os.replace(tmp_path, self.index_path)
+
+        except OSError as e:
+
+            logger.warning(f"Could not save symbol index: {str(e)}")
+
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+    def _add_file_entry(self, path: str, entry: Dict):
+
+        self.files[path]= entry
+
+        for symbol in entry["symbols"]:
+            self.doc_freq.update(symbol["tokens"].keys())
+            self.total_length+= symbol["length"]
+            self.symbol_count+= 1
+
+
+    def _remove_file_entry(self, path: str):
+
+        entry= self.files.pop(path, None)
+        if entry is None:
+            return
+
+        for symbol in entry["symbols"]:
+
+            for token in symbol["tokens"]:
+                # Drop tokens that no longer occur anywhere
+                if self.doc_freq[token] <= 1:
+                    del self.doc_freq[token]
+                else:
+                    self.doc_freq[token]-= 1
+
+            self.total_length-= symbol["length"]
+            self.symbol_count-= 1
+
+
+    def _iter_source_files(self):
+
+        index_name= os.path.basename(self.index_path)
+
+        for dirpath, dirnames, filenames in os.walk(self.root):
+
+            dirnames[:]= [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+
+            for filename in filenames:
+                if filename.endswith(".py") and filename != index_name:
+                    yield os.path.join(dirpath, filename)
+
+
+    def refresh(self) -> bool:
+
+        """
+        Re-parse only the files whose mtime or size changed since the last refresh.
+        The tree walk, parsing and saving happen outside _lock, which is held only
+        while the changes are applied. Returns True when the index was modified. """
+
+        with self._refresh_lock:
+
+            # Only the refresher mutates self.files, so it can be read here without _lock
+            updates= {}
+            seen= set()
+
+            for full_path in self._iter_source_files():
+
+                path= os.path.relpath(full_path, self.root)
+                seen.add(path)
+
+                try:
+                    stat= os.stat(full_path)
+                except OSError:
+                    continue
+
+                entry= self.files.get(path)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+
+                updates[path]= {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "symbols": self._extract_symbols(full_path, path),
+                }
+
+            removed= [path for path in self.files if path not in seen]
+
+            if not updates and not removed:
+                return False
+
+            with self._lock:
+
+                for path in removed:
+                    self._remove_file_entry(path)
+
+                for path, entry in updates.items():
+                    self._remove_file_entry(path)
+                    self._add_file_entry(path, entry)
+
+            logger.debug(f"Symbol index updated: {self.symbol_count} symbols")
+            self.save()
+
+            return True
+
+
+    def _extract_symbols(self, full_path: str, path: str) -> List[Dict]:
+
+        """ Parse a file with ast and collect its definitions. """
+
+        try:
+
+            with open(full_path, "r", encoding="utf-8") as f:
+                tree= ast.parse(f.read(), filename=full_path)
+
+        except (OSError, SyntaxError, ValueError, UnicodeDecodeError) as e:
+
+            logger.debug(f"Skipping {path} in symbol index: {str(e)}")
+            return []
+
+        symbols= []
+        self._visit(tree, path, "", symbols)
+        return symbols
+
+
+    def _visit(self, node: ast.AST, path: str, prefix: str, symbols: List[Dict]):
+
+        for child in ast.iter_child_nodes(node):
+
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+
+                qualname= f"{prefix}{child.name}"
+                signature= self._signature(child)
+                docstring= ast.get_docstring(child) or ""
+
+                tokens= Counter(tokenize(f"{qualname} {signature} {docstring}"))
+
+                symbols.append({
+                    "name": child.name,
+                    "qualname": qualname,
+                    "kind": "class" if isinstance(child, ast.ClassDef) else "function",
+                    "path": path,
+                    "lineno": child.lineno,
+                    "signature": signature,
+                    "docstring": docstring,
+                    "tokens": dict(tokens),
+                    "length": sum(tokens.values()),
+                })
+
+                # Index methods and nested classes, but not functions local to a function body
+                if isinstance(child, ast.ClassDef):
+                    self._visit(child, path, f"{qualname}.", symbols)
+
+
+    def _signature(self, node: ast.AST) -> str:
+
+        if isinstance(node, ast.ClassDef):
+            bases= ", ".join(ast.unparse(base) for base in node.bases)
+            return f"class {node.name}({bases}):" if bases else f"class {node.name}:"
+
+        prefix= "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        returns= f" -> {ast.unparse(node.returns)}" if node.returns else ""
+        return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}:"
+
+
+    def search(self, query: str, limit: int = 10, exclude_names: Optional[set] = None) -> List[Dict]:
+
+        """ Rank symbols against the query with BM25 plus an exact-name bonus. """
+
+        query_tokens= set(tokenize(query))
+        query_names= set(IDENTIFIER_RE.findall(query))
+        exclude_names= exclude_names or set()
+
+        # Snapshot the corpus under the lock; refresh() may replace entries concurrently
+        with self._lock:
+            symbol_count= self.symbol_count
+            total_length= self.total_length
+            doc_freq= {token: self.doc_freq[token] for token in query_tokens}
+            symbols= [symbol for entry in self.files.values() for symbol in entry["symbols"]]
+
+        if not query_tokens or not symbol_count:
+            return []
+
+        avg_length= total_length / symbol_count
+        scored= []
+
+        for symbol in symbols:
+
+            if symbol["name"] in exclude_names:
+                continue
+
+            score= 0.0
+            tokens= symbol["tokens"]
+
+            for token in query_tokens:
+
+                tf= tokens.get(token)
+                if not tf:
+                    continue
+
+                df= doc_freq[token]
+                idf= math.log(1 + (symbol_count - df + 0.5) / (df + 0.5))
+                norm= tf + BM25_K1 * (1 - BM25_B + BM25_B * symbol["length"] / avg_length)
+                score+= idf * tf * (BM25_K1 + 1) / norm
+
+            if symbol["name"] in query_names:
+                score+= EXACT_NAME_BONUS
+
+            if score > 0:
+                scored.append((score, symbol))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [symbol for _, symbol in scored[:limit]]
+
+
+    def build_context(self, original_code: str, user_prompt: str, token_budget: int) -> str:
+
+        """
+        Render the most relevant definitions for the snippet, stopping once the
+        token budget is spent. Symbols defined in the snippet itself are skipped. """
+
+        local_names= set(re.findall(r"(?:def|class)\s+([A-Za-z_][A-Za-z0-9_]*)", original_code))
+        candidates= self.search(f"{original_code}\n{user_prompt}", limit=25, exclude_names=local_names)
+
+        blocks= []
+        used= 0
+
+        for symbol in candidates:
+
+            block= f"# {symbol['path']}:{symbol['lineno']} ({symbol['qualname']})\n{symbol['signature']}"
+            if symbol["docstring"]:
+                block+= f'\n    """{symbol["docstring"]}"""'
+
+            cost= estimate_tokens(block)
+            if used + cost > token_budget:
+                continue
+
+            blocks.append(block)
+            used+= cost
+
+        return "\n\n".join(blocks)
@@ -10,4 +10,35 @@ class Config:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     LANGSMITH_API_KEY= os.getenv("LANGCHAIN_API_KEY")
 
-config= Config()
\ No newline at end of file
+    # Deployment environment: "development" or "production"
+    APP_ENV= os.getenv("APP_ENV", "development")
+    IS_PRODUCTION= APP_ENV == "production"
+
+    # Optional project symbol index used to add cross-file context to the prompt
+    PROJECT_INDEX_ROOT= os.getenv("PROJECT_INDEX_ROOT")
+    PROJECT_INDEX_PATH= os.getenv("PROJECT_INDEX_PATH", ".code_iterator_index.json")
+    PROJECT_CONTEXT_TOKEN_BUDGET= int(os.getenv("PROJECT_CONTEXT_TOKEN_BUDGET", "1500"))
+    PROJECT_INDEX_REFRESH_SECONDS= float(os.getenv("PROJECT_INDEX_REFRESH_SECONDS", "5"))
+
+    # API server and launcher settings
+    API_HOST= os.getenv("API_HOST", "127.0.0.1")
+    API_PORT= int(os.getenv("API_PORT", "8000"))
+    API_WORKERS= int(os.getenv("API_WORKERS", str(min(4, os.cpu_count() or 1))))
+    API_STARTUP_TIMEOUT= float(os.getenv("API_STARTUP_TIMEOUT", "120"))
+
+    # Maximum size of a request body after gzip/brotli decompression
+    MAX_DECOMPRESSED_BODY_BYTES= int(os.getenv("MAX_DECOMPRESSED_BODY_BYTES", str(16 * 1024 * 1024)))
+
+    # CPU-heavy steps (diff, output parsing) run in a process pool above this input length in characters; 0 workers disables the pool
+    CPU_POOL_WORKERS= int(os.getenv("CPU_POOL_WORKERS", "2"))
+    CPU_OFFLOAD_THRESHOLD_CHARS= int(os.getenv("CPU_OFFLOAD_THRESHOLD_CHARS", str(1024 * 1024)))
+    # Offloaded tasks that wait longer than this in the pool queue are logged as warnings
+    CPU_SLOW_QUEUE_MS= float(os.getenv("CPU_SLOW_QUEUE_MS", "250"))
+
+    # Logging: production defaults to enqueued JSON at INFO with sampled success logs
+    LOG_LEVEL= os.getenv("LOG_LEVEL", "INFO" if IS_PRODUCTION else "DEBUG").upper()
+    LOG_FORMAT= os.getenv("LOG_FORMAT", "json" if IS_PRODUCTION else "pretty")
+    LOG_ENQUEUE= os.getenv("LOG_ENQUEUE", "true" if IS_PRODUCTION else "false").lower() in ("1", "true", "yes")
+    LOG_SAMPLE_RATE= float(os.getenv("LOG_SAMPLE_RATE", "0.1" if IS_PRODUCTION else "1.0"))
+
+config= Config()
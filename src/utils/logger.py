@@ -1,9 +1,157 @@
+from src.utils.config import config
+from contextvars import ContextVar
 from loguru import logger
+import threading
+import asyncio
+import random
+import queue
+import json
+import zlib
 import sys
 
-# Configure loguru to output logs to console
-logger.remove()
+# Correlation id of the request being handled, attached to every log record
+request_id_var: ContextVar[str]= ContextVar("request_id", default="-")
 
-logger.add(sys.stdout, level="DEBUG", format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>")
+PRETTY_FORMAT= "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{extra[request_id]}</cyan> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
 
 
+def _add_request_id(record):
+    record["extra"].setdefault("request_id", request_id_var.get())
+
+
+def _json_format(record) -> str:
+
+    """ Render a record as one compact JSON line. """
+
+    payload= {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "request_id": record["extra"].get("request_id", "-"),
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+
+    if record["exception"] is not None:
+        payload["exception"]= repr(record["exception"].value)
+
+    record["extra"]["_json"]= json.dumps(payload, ensure_ascii=False, default=str)
+    return "{extra[_json]}\n"
+
+
+class QueueWriter:
+
+    """
+    Non-blocking sink: log lines are put on an in-process queue and written in batches
+    by a background thread, so callers never wait on a slow or contended stream.
+    Cheaper than loguru's enqueue=True, which pickles every record. """
+
+    _STOP= object()
+
+    def __init__(self, stream):
+
+        self.stream= stream
+        self.queue= queue.SimpleQueue()
+        self.thread= threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+
+    def isatty(self) -> bool:
+
+        return hasattr(self.stream, "isatty") and self.stream.isatty()
+
+
+    def write(self, message: str):
+
+        self.queue.put(message)
+
+
+    def _run(self):
+
+        while True:
+
+            batch= [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop= batch[-1] is self._STOP
+            lines= [line for line in batch if line is not self._STOP]
+
+            try:
+                self.stream.write("".join(lines))
+                self.stream.flush()
+            except Exception:
+                pass
+
+            if stop:
+                return
+
+
+    def stop(self):
+
+        """ Write the remaining lines and stop the writer thread (called by logger.remove()). """
+
+        self.queue.put(self._STOP)
+        self.thread.join(timeout=5)
+
+
+    async def complete(self):
+
+        """ Wait until the queued lines have been written (called by logger.complete()). """
+
+        while not self.queue.empty():
+            await asyncio.sleep(0.01)
+
+
+def _sampling_filter(sample_rate: float):
+
+    """
+    Keep every record except those bound with sampled=True, which are kept with the given
+    probability. The decision is made once per request (a stable hash of its request id),
+    so a sampled request keeps its whole success trail. Records outside a request are drawn at random. """
+
+    def _filter(record) -> bool:
+
+        if sample_rate >= 1 or not record["extra"].get("sampled"):
+            return True
+
+        request_id= record["extra"].get("request_id", "-")
+        if request_id == "-":
+            return random.random() < sample_rate
+
+        return zlib.crc32(request_id.encode("utf-8")) / 0x100000000 < sample_rate
+
+    return _filter
+
+
+def configure_logging(level: str = "DEBUG", fmt: str = "pretty", enqueue: bool = False,
+                      sample_rate: float = 1.0, sink=sys.stdout):
+
+    """ (Re)configure the global loguru logger. """
+
+    logger.remove()
+    logger.configure(patcher=_add_request_id)
+
+    logger.add(
+        QueueWriter(sink) if enqueue else sink,
+        level=level,
+        format=_json_format if fmt == "json" else PRETTY_FORMAT,
+        colorize=False if fmt == "json" else None,
+        filter=_sampling_filter(sample_rate),
+    )
+
+
+# Configure loguru from the environment (LOG_LEVEL, LOG_FORMAT, LOG_ENQUEUE, LOG_SAMPLE_RATE)
+configure_logging(
+    level=config.LOG_LEVEL,
+    fmt=config.LOG_FORMAT,
+    enqueue=config.LOG_ENQUEUE,
+    sample_rate=config.LOG_SAMPLE_RATE,
+)
+
+# Logger for high-volume success messages, subject to LOG_SAMPLE_RATE
+sampled_logger= logger.bind(sampled=True)
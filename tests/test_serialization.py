@@ -0,0 +1,72 @@
+from src.api.serialization import BodyTooLarge, accepted_encodings, decompress_brotli, decompress_gzip
+import gzip
+import pytest
+
+
+def test_decompress_gzip_round_trip():
+
+    assert decompress_gzip(gzip.compress(b"hello"), 100) == b"hello"
+
+
+def test_decompress_gzip_accepts_exactly_the_limit():
+
+    assert decompress_gzip(gzip.compress(b"x" * 64), 64) == b"x" * 64
+
+
+def test_decompress_gzip_over_limit():
+
+    with pytest.raises(BodyTooLarge):
+        decompress_gzip(gzip.compress(b"x" * 65), 64)
+
+
+def test_decompress_gzip_bomb():
+
+    with pytest.raises(BodyTooLarge):
+        decompress_gzip(gzip.compress(b"\0" * (64 * 1024 * 1024)), 1024 * 1024)
+
+
+def test_decompress_gzip_truncated():
+
+    with pytest.raises(ValueError):
+        decompress_gzip(gzip.compress(b"hello world" * 100)[:-8], 10000)
+
+
+def test_decompress_gzip_multi_member():
+
+    body= gzip.compress(b"first ") + gzip.compress(b"second")
+
+    assert decompress_gzip(body, 100) == b"first second"
+
+
+def test_decompress_gzip_multi_member_limit_is_cumulative():
+
+    body= gzip.compress(b"x" * 40) + gzip.compress(b"y" * 40)
+
+    with pytest.raises(BodyTooLarge):
+        decompress_gzip(body, 64)
+
+
+def test_decompress_brotli():
+
+    brotli= pytest.importorskip("brotli")
+
+    assert decompress_brotli(brotli.compress(b"hello"), 100) == b"hello"
+    assert decompress_brotli(brotli.compress(b"x" * 64), 64) == b"x" * 64
+
+    with pytest.raises(BodyTooLarge):
+        decompress_brotli(brotli.compress(b"x" * 65), 64)
+
+    with pytest.raises(ValueError):
+        decompress_brotli(brotli.compress(b"hello world" * 100)[:-4], 10000)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", {"gzip", "br"}),
+    ("br;q=0, gzip", {"gzip"}),
+    ("gzip;q=0", set()),
+    ("gzip; q=0.5, br;q=1.0", {"gzip", "br"}),
+    ("", set()),
+])
+def test_accepted_encodings(header, expected):
+
+    assert accepted_encodings(header) == expected
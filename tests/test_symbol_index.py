@@ -0,0 +1,124 @@
+from src.backend.symbol_index import SymbolIndex, estimate_tokens
+import pytest
+
+
+HELPERS= '''
+def parse_user_record(row: dict) -> dict:
+    """Turn a CSV row into a user record."""
+
+class UserStore:
+    """Persist users."""
+
+    def save(self, user):
+        """Store a user."""
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+
+    (tmp_path / "helpers.py").write_text(HELPERS)
+    (tmp_path / "billing.py").write_text('def charge_invoice(invoice):\n    """Charge an invoice."""\n')
+    return tmp_path
+
+
+def names(index):
+
+    return {symbol["qualname"] for entry in index.files.values() for symbol in entry["symbols"]}
+
+
+def test_initial_build_indexes_definitions(project):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    assert names(index) == {"parse_user_record", "UserStore", "UserStore.save", "charge_invoice"}
+    assert (project / ".index.json").exists()
+
+
+def test_refresh_reparses_only_changed_files(project, monkeypatch):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    parsed= []
+    original= index._extract_symbols
+    monkeypatch.setattr(index, "_extract_symbols", lambda full_path, path: parsed.append(path) or original(full_path, path))
+
+    (project / "billing.py").write_text('def refund_invoice(invoice):\n    """Refund an invoice."""\n')
+
+    assert index.refresh() is True
+    assert parsed == ["billing.py"]
+    assert "refund_invoice" in names(index)
+    assert "charge_invoice" not in names(index)
+
+    # Nothing changed since: no re-parse at all
+    assert index.refresh() is False
+    assert parsed == ["billing.py"]
+
+
+def test_refresh_drops_deleted_files(project):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    (project / "billing.py").unlink()
+
+    assert index.refresh() is True
+    assert "billing.py" not in index.files
+    assert "charge_invoice" not in names(index)
+    assert "invoice" not in index.doc_freq
+    assert index.symbol_count == 3
+
+
+def test_saved_index_loads_without_reparsing(project, monkeypatch):
+
+    SymbolIndex(str(project), ".index.json")
+
+    def fail(*args):
+        raise AssertionError("unchanged files must not be re-parsed")
+
+    monkeypatch.setattr(SymbolIndex, "_extract_symbols", fail)
+    index= SymbolIndex(str(project), ".index.json")
+
+    assert "parse_user_record" in names(index)
+
+
+def test_build_context_ranks_referenced_symbols_first(project):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    context= index.build_context("user = parse_user_record(row)", "add type hints", token_budget=1000)
+
+    assert context.startswith("# helpers.py:2 (parse_user_record)")
+    assert '"""Turn a CSV row into a user record."""' in context
+
+
+def test_build_context_respects_token_budget(tmp_path):
+
+    (tmp_path / "many.py").write_text("".join(
+        f'def user_helper_{i}(user):\n    """Helper number {i} for user handling."""\n' for i in range(50)
+    ))
+    index= SymbolIndex(str(tmp_path), ".index.json")
+
+    context= index.build_context("handle(user)", "refactor user handling", token_budget=60)
+    blocks= context.split("\n\n")
+
+    assert 0 < len(blocks) < 50
+    assert sum(estimate_tokens(block) for block in blocks) <= 60
+
+
+def test_build_context_skips_symbols_defined_in_snippet(project):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    snippet= "def parse_user_record(row):\n    return UserStore().save(row)\n"
+    context= index.build_context(snippet, "", token_budget=1000)
+
+    assert "(parse_user_record)" not in context
+    assert "(UserStore)" in context
+
+
+def test_search_exclude_names(project):
+
+    index= SymbolIndex(str(project), ".index.json")
+
+    assert [s["name"] for s in index.search("charge_invoice")][:1] == ["charge_invoice"]
+    assert all(s["name"] != "charge_invoice" for s in index.search("charge_invoice", exclude_names={"charge_invoice"}))